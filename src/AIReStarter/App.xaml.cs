@@ -22,6 +22,15 @@ namespace AIReStarter;
 /// </summary>
 public partial class App : System.Windows.Application
 {
+    private static readonly string[] ConfigCandidateFiles =
+    {
+        "profiles.local.toml",
+        "profiles.toml",
+        "profiles.example.toml"
+    };
+
+    private const int LogBufferSize = 10_000;
+
     private IHost? _host;
     private HotKeyService? _hotKeyService;
     private MonitorService? _monitorService;
@@ -72,7 +81,7 @@ public partial class App : System.Windows.Application
             .ConfigureServices(services =>
             {
                 services.AddSingleton(config);
-                services.AddSingleton<ConfigLoader>();
+                services.AddSingleton(loader);
                 services.AddSingleton<Core.DisplayManager>();
                 services.AddSingleton<Core.ScreenCaptureService>();
                 services.AddSingleton<Core.TemplateMatcher>();
@@ -166,14 +175,7 @@ public partial class App : System.Windows.Application
 
     private static string? ResolveConfigPath()
     {
-        var candidateFiles = new[]
-        {
-            "profiles.local.toml",
-            "profiles.toml",
-            "profiles.example.toml"
-        };
-
-        foreach (var file in candidateFiles)
+        foreach (var file in ConfigCandidateFiles)
         {
             var fromCurrent = Path.Combine(Directory.GetCurrentDirectory(), file);
             if (File.Exists(fromCurrent))
@@ -182,7 +184,7 @@ public partial class App : System.Windows.Application
             }
         }
 
-        foreach (var file in candidateFiles)
+        foreach (var file in ConfigCandidateFiles)
         {
             var fromBase = Path.Combine(AppContext.BaseDirectory, file);
             if (File.Exists(fromBase))
@@ -201,7 +203,7 @@ public partial class App : System.Windows.Application
                 break;
             }
 
-            foreach (var file in candidateFiles)
+            foreach (var file in ConfigCandidateFiles)
             {
                 var candidate = Path.Combine(parent.FullName, file);
                 if (File.Exists(candidate))
@@ -225,15 +227,34 @@ public partial class App : System.Windows.Application
             ? parsedLevel
             : LogEventLevel.Information;
 
+        // 監視ループや入力送出のスレッドがコンソール/ファイルへの書き込みで待たされないよう、
+        // 出力は有界キューを介して専用スレッドで行う（あふれた場合は待たずに破棄する）
         Log.Logger = new LoggerConfiguration()
             .MinimumLevel.Is(logLevel)
             .Enrich.FromLogContext()
-            .WriteTo.Console()
-            .WriteTo.File(
-                Path.Combine(logDirectory, "app.log"),
-                rollingInterval: RollingInterval.Day,
-                retainedFileCountLimit: 5,
-                encoding: Encoding.UTF8)
+            .WriteTo.Async(
+                sinks =>
+                {
+                    if (HasStandardOutput())
+                    {
+                        sinks.Console();
+                    }
+
+                    sinks.File(
+                        Path.Combine(logDirectory, "app.log"),
+                        rollingInterval: RollingInterval.Day,
+                        retainedFileCountLimit: 5,
+                        encoding: Encoding.UTF8);
+                },
+                bufferSize: LogBufferSize,
+                blockWhenFull: false)
             .CreateLogger();
     }
+
+    private static bool HasStandardOutput()
+    {
+        // WinExeをエクスプローラー等から起動した場合は標準出力が無く、
+        // Consoleシンクは書式化したログを捨てるだけになるため登録しない
+        return Console.OpenStandardOutput() != Stream.Null;
+    }
 }
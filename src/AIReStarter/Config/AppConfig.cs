@@ -10,6 +10,13 @@ public enum ExecutionMode
     Keyboard
 }
 
+public enum MatchMethod
+{
+    CCoeffNormed,
+    SqDiffNormed,
+    CCorrNormed
+}
+
 public sealed record MonitorRegion
 {
     public double X { get; init; }
@@ -34,6 +41,9 @@ public sealed record MatchingConfig
 {
     public string File { get; init; } = string.Empty;
     public double Threshold { get; init; } = 0.8;
+    public bool Grayscale { get; init; }
+    public int PyramidLevels { get; init; }
+    public MatchMethod Method { get; init; } = MatchMethod.CCoeffNormed;
 }
 
 public abstract record ActionConfig
@@ -137,7 +137,10 @@ public sealed class ConfigLoader
         return new MatchingConfig
         {
             File = resolvedPath,
-            Threshold = GetDouble(table, "threshold", 0.8)
+            Threshold = GetDouble(table, "threshold", 0.8),
+            Grayscale = GetBool(table, "grayscale", false),
+            PyramidLevels = Math.Max(0, GetInt(table, "pyramid_levels", 0)),
+            Method = ParseMatchMethod(GetString(table, "method", "ccoeff_normed"))
         };
     }
 
@@ -188,6 +191,17 @@ public sealed class ConfigLoader
         }
     }
 
+    private static MatchMethod ParseMatchMethod(string value)
+    {
+        return value.ToLowerInvariant() switch
+        {
+            "ccoeff_normed" => MatchMethod.CCoeffNormed,
+            "sqdiff_normed" => MatchMethod.SqDiffNormed,
+            "ccorr_normed" => MatchMethod.CCorrNormed,
+            _ => MatchMethod.CCoeffNormed
+        };
+    }
+
     private static ExecutionMode ParseExecutionMode(string value)
     {
         return value.ToLowerInvariant() switch
@@ -252,6 +266,13 @@ public sealed class ConfigLoader
         };
     }
 
+    private static bool GetBool(TomlTable table, string key, bool defaultValue)
+    {
+        return table.TryGetValue(key, out var value) && value is bool b
+            ? b
+            : defaultValue;
+    }
+
     private static IReadOnlyList<string> GetStringArray(TomlTable table, string key)
     {
         if (table.TryGetValue(key, out var value) && value is TomlArray array)
@@ -3,9 +3,11 @@ using System.Collections.Generic;
 using System.Drawing;
 using System.Linq;
 using System.Runtime.InteropServices;
+using System.Threading;
 using System.Windows.Forms;
 using AIReStarter.Config;
 using Microsoft.Extensions.Logging;
+using Microsoft.Win32;
 
 namespace AIReStarter.Core;
 
@@ -13,16 +15,26 @@ public sealed record DisplayInfo(string DeviceName, Rectangle Bounds, double Dpi
 
 /// <summary>
 /// マルチモニター情報とDPIスケーリングを管理する。
+/// モニター一覧はディスプレイ構成が変わるまでキャッシュする。
 /// </summary>
-public sealed class DisplayManager
+public sealed class DisplayManager : IDisposable
 {
     private readonly ILogger<DisplayManager> _logger;
+    private readonly object _gate = new();
+    private MonitorSnapshot? _snapshot;
+    private int _layoutVersion;
 
     public DisplayManager(ILogger<DisplayManager> logger)
     {
         _logger = logger;
+        SystemEvents.DisplaySettingsChanged += OnDisplaySettingsChanged;
     }
 
+    /// <summary>
+    /// ディスプレイ構成が変わるたびに増える値。座標の計算結果を使い回す側が無効化の判定に使う。
+    /// </summary>
+    public int LayoutVersion => Volatile.Read(ref _layoutVersion);
+
     public Rectangle GetVirtualScreenBounds()
     {
         var bounds = SystemInformation.VirtualScreen;
@@ -30,6 +42,19 @@ public sealed class DisplayManager
     }
 
     public IReadOnlyList<DisplayInfo> GetMonitors()
+    {
+        return GetSnapshot().Monitors;
+    }
+
+    private MonitorSnapshot GetSnapshot()
+    {
+        lock (_gate)
+        {
+            return _snapshot ??= new MonitorSnapshot(EnumerateMonitors());
+        }
+    }
+
+    private IReadOnlyList<DisplayInfo> EnumerateMonitors()
     {
         var list = new List<DisplayInfo>();
 
@@ -67,19 +92,32 @@ public sealed class DisplayManager
 
     private Rectangle ResolveMonitor(string? preferredMonitor)
     {
-        var monitors = GetMonitors();
-        if (!string.IsNullOrWhiteSpace(preferredMonitor))
+        if (!string.IsNullOrWhiteSpace(preferredMonitor) &&
+            GetSnapshot().ByDeviceName.TryGetValue(preferredMonitor, out var match))
         {
-            var match = monitors.FirstOrDefault(m => string.Equals(m.DeviceName, preferredMonitor, StringComparison.OrdinalIgnoreCase));
-            if (match is not null)
-            {
-                return match.Bounds;
-            }
+            return match.Bounds;
         }
 
         return GetVirtualScreenBounds();
     }
 
+    private void OnDisplaySettingsChanged(object? sender, EventArgs e)
+    {
+        lock (_gate)
+        {
+            _snapshot = null;
+        }
+
+        Interlocked.Increment(ref _layoutVersion);
+
+        _logger.LogInformation("ディスプレイ構成の変更を検出しました。モニター情報を再取得します。");
+    }
+
+    public void Dispose()
+    {
+        SystemEvents.DisplaySettingsChanged -= OnDisplaySettingsChanged;
+    }
+
     private static double GetDpiScale(IntPtr monitorHandle)
     {
         const uint DefaultDpi = 96;
@@ -100,6 +138,27 @@ public sealed class DisplayManager
         return graphics.DpiX / DefaultDpi;
     }
 
+    /// <summary>
+    /// 列挙結果とデバイス名の索引をまとめて保持する。
+    /// </summary>
+    private sealed class MonitorSnapshot
+    {
+        public MonitorSnapshot(IReadOnlyList<DisplayInfo> monitors)
+        {
+            Monitors = monitors;
+            ByDeviceName = new Dictionary<string, DisplayInfo>(StringComparer.OrdinalIgnoreCase);
+            foreach (var monitor in monitors)
+            {
+                // 同名が重複した場合は従来のFirstOrDefaultと同じく先頭を優先する
+                ByDeviceName.TryAdd(monitor.DeviceName, monitor);
+            }
+        }
+
+        public IReadOnlyList<DisplayInfo> Monitors { get; }
+
+        public Dictionary<string, DisplayInfo> ByDeviceName { get; }
+    }
+
     private delegate bool MonitorEnumProc(IntPtr hMonitor, IntPtr hdcMonitor, ref Rect lprcMonitor, IntPtr dwData);
 
     [DllImport("user32.dll")]
@@ -38,6 +38,17 @@ public sealed class MatchGuard
         return true;
     }
 
+    /// <summary>
+    /// クールダウン中かどうかを返す。クールダウン中はShouldTriggerが必ずfalseになるため、
+    /// 呼び出し側はキャプチャとマッチングを省略できる。
+    /// </summary>
+    public bool IsCoolingDown(string key, DateTimeOffset now)
+    {
+        return _states.TryGetValue(key, out var state) &&
+               state.CooldownUntil.HasValue &&
+               now < state.CooldownUntil.Value;
+    }
+
     private sealed class MatchState
     {
         public int Consecutive { get; set; }
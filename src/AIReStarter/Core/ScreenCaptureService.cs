@@ -1,4 +1,5 @@
 using System;
+using System.Collections.Generic;
 using System.Drawing;
 using System.Drawing.Imaging;
 using DrawingPoint = System.Drawing.Point;
@@ -7,29 +8,159 @@ using OpenCvSharp.Extensions;
 
 namespace AIReStarter.Core;
 
-public sealed record CaptureResult(Mat Frame, DrawingPoint Origin) : IDisposable
+/// <summary>
+/// キャプチャしたフレームと、照合時に遅延作成する変換画像を所有する。
+/// </summary>
+public sealed class CaptureResult : IDisposable
 {
+    private readonly object _gate = new();
+    private Mat? _grayFrame;
+    private List<Mat>? _colorPyramid;
+    private List<Mat>? _grayPyramid;
+
+    public CaptureResult(Mat frame, DrawingPoint origin)
+    {
+        Frame = frame;
+        Origin = origin;
+    }
+
+    public Mat Frame { get; }
+
+    public DrawingPoint Origin { get; }
+
+    /// <summary>
+    /// グレースケール版のフレームを返す。変換は初回参照時に一度だけ行い、
+    /// フレームがすでに1チャンネルの場合は変換せずそのまま返す。
+    /// </summary>
+    public Mat GetGrayFrame()
+    {
+        lock (_gate)
+        {
+            if (_grayFrame is null)
+            {
+                _grayFrame = Frame.Channels() switch
+                {
+                    1 => Frame,
+                    4 => ConvertToGray(ColorConversionCodes.BGRA2GRAY),
+                    _ => ConvertToGray(ColorConversionCodes.BGR2GRAY)
+                };
+            }
+
+            return _grayFrame;
+        }
+    }
+
+    /// <summary>
+    /// フレームを指定段数だけpyrDownで縮小した画像を返す。0段目は元のフレーム。
+    /// 縮小結果は初回参照時に作成し、同じキャプチャを使うテンプレート間で共有する。
+    /// </summary>
+    public Mat GetPyramidLevel(bool grayscale, int level)
+    {
+        var baseFrame = grayscale ? GetGrayFrame() : Frame;
+        if (level == 0)
+        {
+            return baseFrame;
+        }
+
+        lock (_gate)
+        {
+            var pyramid = grayscale
+                ? (_grayPyramid ??= new List<Mat>())
+                : (_colorPyramid ??= new List<Mat>());
+            while (pyramid.Count < level)
+            {
+                var source = pyramid.Count == 0 ? baseFrame : pyramid[^1];
+                var down = new Mat();
+                Cv2.PyrDown(source, down);
+                pyramid.Add(down);
+            }
+
+            return pyramid[level - 1];
+        }
+    }
+
+    private Mat ConvertToGray(ColorConversionCodes code)
+    {
+        var gray = new Mat();
+        Cv2.CvtColor(Frame, gray, code);
+        return gray;
+    }
+
     public void Dispose()
     {
+        DisposePyramid(_colorPyramid);
+        DisposePyramid(_grayPyramid);
+
+        if (!ReferenceEquals(_grayFrame, Frame))
+        {
+            _grayFrame?.Dispose();
+        }
+
         Frame.Dispose();
     }
+
+    private static void DisposePyramid(List<Mat>? pyramid)
+    {
+        if (pyramid is null)
+        {
+            return;
+        }
+
+        foreach (var level in pyramid)
+        {
+            level.Dispose();
+        }
+    }
 }
 
 /// <summary>
 /// DPI補正後の絶対座標を基にスクリーンキャプチャを実施する。
+/// キャプチャ用のBitmap/Graphicsは同一サイズの間は再利用する。
 /// </summary>
-public sealed class ScreenCaptureService
+public sealed class ScreenCaptureService : IDisposable
 {
+    private readonly object _gate = new();
+    private Bitmap? _bitmap;
+    private Graphics? _graphics;
+
     public CaptureResult Capture(Rectangle bounds)
     {
-        var bitmap = new Bitmap(bounds.Width, bounds.Height, PixelFormat.Format24bppRgb);
+        lock (_gate)
+        {
+            EnsureBuffer(bounds.Size);
+            _graphics!.CopyFromScreen(new DrawingPoint(bounds.Left, bounds.Top), DrawingPoint.Empty, bounds.Size, CopyPixelOperation.SourceCopy);
 
-        using var graphics = Graphics.FromImage(bitmap);
-        graphics.CopyFromScreen(new DrawingPoint(bounds.Left, bounds.Top), DrawingPoint.Empty, bounds.Size, CopyPixelOperation.SourceCopy);
+            // ToMatはピクセルをコピーするため、返却後にBitmapを再利用しても影響しない
+            var mat = BitmapConverter.ToMat(_bitmap!);
+            return new CaptureResult(mat, new DrawingPoint(bounds.Left, bounds.Top));
+        }
+    }
 
-        var mat = BitmapConverter.ToMat(bitmap);
-        bitmap.Dispose();
+    private void EnsureBuffer(System.Drawing.Size size)
+    {
+        if (_bitmap is not null && _bitmap.Size == size)
+        {
+            return;
+        }
 
-        return new CaptureResult(mat, new DrawingPoint(bounds.Left, bounds.Top));
+        ReleaseBuffer();
+        _bitmap = new Bitmap(size.Width, size.Height, PixelFormat.Format24bppRgb);
+        _graphics = Graphics.FromImage(_bitmap);
+    }
+
+    private void ReleaseBuffer()
+    {
+        _graphics?.Dispose();
+        _graphics = null;
+        _bitmap?.Dispose();
+        _bitmap = null;
+    }
+
+    public void Dispose()
+    {
+        lock (_gate)
+        {
+            ReleaseBuffer();
+        }
     }
 }
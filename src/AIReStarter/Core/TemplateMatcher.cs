@@ -1,4 +1,8 @@
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
 using System.IO;
+using System.Linq;
 using System.Threading;
 using System.Threading.Tasks;
 using AIReStarter.Config;
@@ -6,6 +10,7 @@ using Microsoft.Extensions.Logging;
 using OpenCvSharp;
 using DrawingPoint = System.Drawing.Point;
 using CvPoint = OpenCvSharp.Point;
+using CvRect = OpenCvSharp.Rect;
 
 namespace AIReStarter.Core;
 
@@ -13,45 +18,101 @@ public sealed record MatchResult(DrawingPoint Location, double Score);
 
 /// <summary>
 /// OpenCVによるテンプレートマッチングを行う。
+/// デコード済みのテンプレート画像はファイルパスと色モード単位でキャッシュし、
+/// テンプレートのフォルダを監視して変更を検知した場合のみ読み直す。
+/// pyramid_levelsが指定された場合は縮小画像で候補位置を絞り込んでから元解像度で照合する。
 /// </summary>
-public sealed class TemplateMatcher
+public sealed partial class TemplateMatcher : IDisposable
 {
+    // 縮小画像ではスコアが下がりやすいため、粗探索の足切りはしきい値より緩める
+    private const double PyramidThresholdSlack = 0.1;
+    // 1段上の候補位置を2倍した座標の周囲に確保する探索余白（px）
+    private const int PyramidSearchPadding = 4;
+    // これより小さくなる階層は特徴が潰れるため作らない
+    private const int MinPyramidTemplateSize = 8;
+    // 粗い階層で詳細探索に回す候補の上限
+    private const int MaxPyramidCandidates = 5;
+    private const int MaxPreloadParallelism = 8;
+
     private readonly ILogger<TemplateMatcher> _logger;
+    private readonly ConcurrentDictionary<TemplateKey, CachedTemplate> _templateImages = new();
+    // 変更を検知するたびに進めるパスごとの世代番号。読み込み中に変更された画像をキャッシュに残さないために使う
+    private readonly ConcurrentDictionary<string, int> _generations = new(StringComparer.OrdinalIgnoreCase);
+    // 照合結果の行列はサイズが変わらない限りテンプレートごとに使い回す。
+    // 同じテンプレートの照合が同時に走ることはないため、並列照合でも共有されない
+    private readonly ConcurrentDictionary<TemplateConfig, Mat> _resultBuffers = new(ReferenceEqualityComparer.Instance);
+    private readonly Dictionary<string, FileSystemWatcher> _watchers = new(StringComparer.OrdinalIgnoreCase);
+    private readonly object _watcherGate = new();
+
+    // GetBuildInformationのうち、照合速度に影響するSIMD/並列化/IPPの行だけをログに残す
+    private static readonly string[] BuildFeatureKeys =
+    {
+        "Baseline:",
+        "Dispatched code generation:",
+        "Parallel framework:",
+        "Intel IPP:"
+    };
 
     public TemplateMatcher(ILogger<TemplateMatcher> logger)
     {
         _logger = logger;
+
+        // 最適化コード（SIMD/IPP）の利用は既定で有効だが、明示的に有効化して状態を記録する
+        Cv2.SetUseOptimized(true);
+        LogBuildFeatures();
     }
 
-    public async Task<MatchResult?> FindAsync(TemplateConfig template, CaptureResult capture, CancellationToken cancellationToken)
+    private void LogBuildFeatures()
     {
-        if (!File.Exists(template.Matching.File))
+        if (!_logger.IsEnabled(LogLevel.Information))
         {
-            _logger.LogWarning("テンプレート画像が見つかりません: {File}", template.Matching.File);
-            return null;
+            return;
         }
 
+        var features = Cv2.GetBuildInformation()
+            .Split('\n')
+            .Select(line => line.Trim())
+            .Where(line => BuildFeatureKeys.Any(key => line.StartsWith(key, StringComparison.Ordinal)));
+
+        LogOpenCvOptimization(_logger, Cv2.UseOptimized(), Cv2.GetNumThreads(), string.Join(" / ", features));
+    }
+
+    public async Task<MatchResult?> FindAsync(TemplateConfig template, CaptureResult capture, CancellationToken cancellationToken)
+    {
         return await Task.Run(() =>
         {
-            using var templateImage = Cv2.ImRead(template.Matching.File, ImreadModes.Color);
-            if (templateImage.Empty())
+            var grayscale = template.Matching.Grayscale;
+            var cachedTemplate = GetTemplate(template.Matching.File, grayscale);
+            if (cachedTemplate is null)
             {
-                _logger.LogWarning("テンプレート画像の読み込みに失敗しました: {File}", template.Matching.File);
                 return null;
             }
 
-            if (templateImage.Width > capture.Frame.Width || templateImage.Height > capture.Frame.Height)
+            // グレースケール照合では同じキャプチャを共有するテンプレート間で変換結果を使い回す
+            var frame = grayscale ? capture.GetGrayFrame() : capture.Frame;
+            var templateImage = cachedTemplate.Image;
+            if (templateImage.Width > frame.Width || templateImage.Height > frame.Height)
             {
-                _logger.LogWarning(
-                    "テンプレートサイズがキャプチャ領域より大きいためスキップします: {TemplateSize} vs {CaptureSize}",
-                    $"{templateImage.Width}x{templateImage.Height}",
-                    $"{capture.Frame.Width}x{capture.Frame.Height}");
+                LogTemplateLargerThanCapture(_logger, templateImage.Width, templateImage.Height, frame.Width, frame.Height);
                 return null;
             }
 
-            using var result = new Mat();
-            Cv2.MatchTemplate(capture.Frame, templateImage, result, TemplateMatchModes.CCoeffNormed);
-            Cv2.MinMaxLoc(result, out _, out var maxVal, out _, out CvPoint maxLoc);
+            double maxVal;
+            CvPoint maxLoc;
+            // テンプレートが小さく縮小画像を作れない場合は、元解像度での通常の照合に切り替える
+            var levels = GetEffectivePyramidLevels(templateImage, template.Matching.PyramidLevels);
+            if (levels > 0)
+            {
+                if (!TryMatchCoarseToFine(capture, grayscale, cachedTemplate, template.Matching, levels, out maxVal, out maxLoc))
+                {
+                    return null;
+                }
+            }
+            else
+            {
+                var result = _resultBuffers.GetOrAdd(template, _ => new Mat());
+                MatchBest(frame, templateImage, template.Matching.Method, result, out maxVal, out maxLoc);
+            }
 
             if (maxVal < template.Matching.Threshold)
             {
@@ -62,4 +123,447 @@ public sealed class TemplateMatcher
             return new MatchResult(absolute, maxVal);
         }, cancellationToken);
     }
+
+    /// <summary>
+    /// 監視開始前にテンプレート画像をまとめて読み込む。
+    /// ファイル読み込みとデコードはテンプレートごとに独立しているため並列に行う。
+    /// </summary>
+    public void Preload(IReadOnlyList<TemplateConfig> templates, CancellationToken cancellationToken)
+    {
+        var options = new ParallelOptions
+        {
+            CancellationToken = cancellationToken,
+            MaxDegreeOfParallelism = Math.Min(MaxPreloadParallelism, Environment.ProcessorCount)
+        };
+
+        // パスが空のテンプレートは照合時に警告して飛ばすため読み込まない。
+        // 同じ画像と色モードを指すテンプレートは1回だけ読み込む（パスはConfigLoaderで絶対パスに解決済み）
+        var targets = templates
+            .Where(template => !string.IsNullOrWhiteSpace(template.Matching.File))
+            .Select(template => (template.Matching.File, template.Matching.Grayscale))
+            .Distinct()
+            .ToList();
+
+        Parallel.ForEach(targets, options, target =>
+        {
+            try
+            {
+                _ = GetTemplate(target.File, target.Grayscale);
+            }
+            catch (Exception ex)
+            {
+                // 1件の失敗で監視全体を止めないよう、警告を記録して照合時の再読み込みに任せる
+                LogPreloadFailed(_logger, ex, target.File);
+            }
+        });
+    }
+
+    /// <summary>
+    /// 読み込み済みのテンプレート画像が指定サイズの領域に収まるかを返す。
+    /// 未読み込みの場合やパスが空の場合は判定できないためtrueを返し、照合時に改めて確認する。
+    /// </summary>
+    public bool FitsWithin(TemplateConfig template, System.Drawing.Size size)
+    {
+        if (string.IsNullOrWhiteSpace(template.Matching.File))
+        {
+            return true;
+        }
+
+        var key = new TemplateKey(Path.GetFullPath(template.Matching.File), template.Matching.Grayscale);
+        if (!_templateImages.TryGetValue(key, out var cached))
+        {
+            return true;
+        }
+
+        return cached.Image.Width <= size.Width && cached.Image.Height <= size.Height;
+    }
+
+    /// <summary>
+    /// 最も粗い階層で全体を探索し、候補位置の周辺だけを1段ずつ細かい階層で探索し直す。
+    /// 粗い階層では偽のピークが本来の位置を上回ることがあるため、足切りを超える候補を
+    /// スコアの高い順に最大MaxPyramidCandidates件まで詳細探索し、元解像度で最も一致したものを採用する。
+    /// </summary>
+    private static bool TryMatchCoarseToFine(CaptureResult capture, bool grayscale, CachedTemplate template, MatchingConfig matching, int levels, out double score, out CvPoint location)
+    {
+        // 縮小したフレームはキャプチャ側にキャッシュされ、同じキャプチャを使う他テンプレートと共有される
+        var coarseTemplate = template.GetLevel(levels);
+
+        using var coarseResult = new Mat();
+        using var refineResult = new Mat();
+        MatchTemplate(capture.GetPyramidLevel(grayscale, levels), coarseTemplate, matching.Method, coarseResult);
+
+        var found = false;
+        score = 0;
+        location = default;
+        for (var candidate = 0; candidate < MaxPyramidCandidates; candidate++)
+        {
+            ReadBest(coarseResult, matching.Method, out var coarseScore, out var coarseLocation);
+            if (coarseScore < matching.Threshold - PyramidThresholdSlack)
+            {
+                break;
+            }
+
+            var refinedScore = coarseScore;
+            var refinedLocation = coarseLocation;
+            for (var level = levels - 1; level >= 0; level--)
+            {
+                var levelFrame = capture.GetPyramidLevel(grayscale, level);
+                var levelTemplate = template.GetLevel(level);
+                var region = GetRefineRegion(refinedLocation, levelTemplate, levelFrame);
+                using var roi = new Mat(levelFrame, region);
+                MatchBest(roi, levelTemplate, matching.Method, refineResult, out refinedScore, out var roiLoc);
+                refinedLocation = new CvPoint(region.X + roiLoc.X, region.Y + roiLoc.Y);
+            }
+
+            if (!found || refinedScore > score)
+            {
+                found = true;
+                score = refinedScore;
+                location = refinedLocation;
+            }
+
+            SuppressCandidate(coarseResult, coarseLocation, coarseTemplate, matching.Method);
+        }
+
+        return found;
+    }
+
+    /// <summary>
+    /// 指定した方式で照合し、最も一致する位置とスコアを返す。
+    /// スコアは方式によらず大きいほど一致度が高い値に揃える。
+    /// </summary>
+    private static void MatchBest(Mat image, Mat templateImage, MatchMethod method, Mat result, out double score, out CvPoint location)
+    {
+        MatchTemplate(image, templateImage, method, result);
+        ReadBest(result, method, out score, out location);
+    }
+
+    private static void MatchTemplate(Mat image, Mat templateImage, MatchMethod method, Mat result)
+    {
+        var mode = method switch
+        {
+            MatchMethod.SqDiffNormed => TemplateMatchModes.SqDiffNormed,
+            MatchMethod.CCorrNormed => TemplateMatchModes.CCorrNormed,
+            _ => TemplateMatchModes.CCoeffNormed
+        };
+        Cv2.MatchTemplate(image, templateImage, result, mode);
+    }
+
+    private static void ReadBest(Mat result, MatchMethod method, out double score, out CvPoint location)
+    {
+        if (method == MatchMethod.SqDiffNormed)
+        {
+            // 二乗差分は小さいほど一致度が高いため、1から引いてしきい値と比較できるようにする
+            Cv2.MinMaxLoc(result, out var minVal, out _, out location, out _);
+            score = 1 - minVal;
+            return;
+        }
+
+        Cv2.MinMaxLoc(result, out _, out score, out _, out location);
+    }
+
+    /// <summary>
+    /// 照合結果のうち候補位置の周辺（テンプレート1個分）を最も不一致な値で塗りつぶし、
+    /// 同じピークが次の候補として選ばれないようにする。
+    /// </summary>
+    private static void SuppressCandidate(Mat result, CvPoint location, Mat templateImage, MatchMethod method)
+    {
+        var neighbourhood = new CvRect(
+            location.X - templateImage.Width / 2,
+            location.Y - templateImage.Height / 2,
+            templateImage.Width,
+            templateImage.Height)
+            .Intersect(new CvRect(0, 0, result.Width, result.Height));
+
+        var worst = method == MatchMethod.SqDiffNormed ? float.MaxValue : float.MinValue;
+        using var masked = new Mat(result, neighbourhood);
+        masked.SetTo(new Scalar(worst));
+    }
+
+    private static int GetEffectivePyramidLevels(Mat templateImage, int requestedLevels)
+    {
+        var levels = 0;
+        var width = templateImage.Width;
+        var height = templateImage.Height;
+        while (levels < requestedLevels)
+        {
+            // pyrDownの出力サイズは(n + 1) / 2
+            width = (width + 1) / 2;
+            height = (height + 1) / 2;
+            if (width < MinPyramidTemplateSize || height < MinPyramidTemplateSize)
+            {
+                break;
+            }
+
+            levels++;
+        }
+
+        return levels;
+    }
+
+    private static CvRect GetRefineRegion(CvPoint coarseLocation, Mat levelTemplate, Mat levelFrame)
+    {
+        var right = Math.Min(levelFrame.Width, coarseLocation.X * 2 + levelTemplate.Width + PyramidSearchPadding);
+        var bottom = Math.Min(levelFrame.Height, coarseLocation.Y * 2 + levelTemplate.Height + PyramidSearchPadding);
+
+        // 端数の丸めで探索範囲がテンプレートより狭くならないよう左上側を広げる
+        var x = Math.Max(0, Math.Min(coarseLocation.X * 2 - PyramidSearchPadding, right - levelTemplate.Width));
+        var y = Math.Max(0, Math.Min(coarseLocation.Y * 2 - PyramidSearchPadding, bottom - levelTemplate.Height));
+        return new CvRect(x, y, right - x, bottom - y);
+    }
+
+    private CachedTemplate? GetTemplate(string path, bool grayscale)
+    {
+        // matchingテーブルが無いテンプレートはパスが空になる。パス操作は空文字で例外になるため先に除外する
+        if (string.IsNullOrWhiteSpace(path))
+        {
+            LogTemplateNotFound(_logger, path);
+            return null;
+        }
+
+        // キャッシュ済みならファイル属性を参照しない（変更はフォルダ監視で検知する）
+        var key = new TemplateKey(Path.GetFullPath(path), grayscale);
+        if (_templateImages.TryGetValue(key, out var cached))
+        {
+            return cached;
+        }
+
+        var file = new FileInfo(key.Path);
+        if (!file.Exists)
+        {
+            LogTemplateNotFound(_logger, path);
+            return null;
+        }
+
+        // 読み込み中の変更を取りこぼさないよう、読み込みより先に監視を開始して世代番号を控える
+        EnsureWatcher(file.DirectoryName!);
+        var generation = _generations.GetOrAdd(key.Path, 0);
+
+        // ImReadはWindowsで非ASCIIパスを開けないため、.NET側で一括読み込みしてメモリ上でデコードする
+        byte[] bytes;
+        try
+        {
+            bytes = File.ReadAllBytes(key.Path);
+        }
+        catch (IOException ex)
+        {
+            // 保存途中などで開けない場合はキャッシュせず、次回の照合で読み直す
+            LogTemplateLoadFailed(_logger, ex, path);
+            return null;
+        }
+        catch (UnauthorizedAccessException ex)
+        {
+            // 読み取り権限が無い場合も、このテンプレートだけを飛ばして監視を続ける
+            LogTemplateLoadFailed(_logger, ex, path);
+            return null;
+        }
+
+        var image = Cv2.ImDecode(bytes, grayscale ? ImreadModes.Grayscale : ImreadModes.Color);
+        if (image.Empty())
+        {
+            image.Dispose();
+            LogTemplateLoadFailed(_logger, null, path);
+            return null;
+        }
+
+        var loaded = new CachedTemplate(image);
+        var stored = _templateImages.GetOrAdd(key, loaded);
+        if (!ReferenceEquals(stored, loaded))
+        {
+            // 並列照合などで同じ画像を別のスレッドが先に登録した場合はそちらを使い、今回の画像は破棄する
+            loaded.Dispose();
+            return stored;
+        }
+
+        if (_generations[key.Path] != generation)
+        {
+            // 読み込みから登録までの間に変更を検知した場合は古い内容の可能性があるため、
+            // 今回の照合にだけ使い、キャッシュからは外して次回読み直す
+            _templateImages.TryRemove(new KeyValuePair<TemplateKey, CachedTemplate>(key, loaded));
+            return loaded;
+        }
+
+        LogTemplateLoaded(_logger, key.Path, image.Width, image.Height);
+
+        return loaded;
+    }
+
+    private void EnsureWatcher(string directory)
+    {
+        lock (_watcherGate)
+        {
+            if (_watchers.ContainsKey(directory))
+            {
+                return;
+            }
+
+            var watcher = new FileSystemWatcher(directory)
+            {
+                NotifyFilter = NotifyFilters.FileName | NotifyFilters.LastWrite | NotifyFilters.Size
+            };
+            watcher.Changed += OnTemplateFileChanged;
+            watcher.Created += OnTemplateFileChanged;
+            watcher.Deleted += OnTemplateFileChanged;
+            watcher.Renamed += OnTemplateFileRenamed;
+            watcher.Error += OnWatcherError;
+            watcher.EnableRaisingEvents = true;
+            _watchers.Add(directory, watcher);
+        }
+    }
+
+    private void OnTemplateFileChanged(object? sender, FileSystemEventArgs e)
+    {
+        Invalidate(e.FullPath);
+    }
+
+    private void OnTemplateFileRenamed(object? sender, RenamedEventArgs e)
+    {
+        Invalidate(e.OldFullPath);
+        Invalidate(e.FullPath);
+    }
+
+    private void OnWatcherError(object? sender, ErrorEventArgs e)
+    {
+        // 監視バッファのあふれなどで変更を取りこぼした可能性があるため、すべて読み直させる
+        LogWatcherError(_logger, e.GetException());
+        foreach (var path in _generations.Keys)
+        {
+            AdvanceGeneration(path);
+        }
+
+        _templateImages.Clear();
+    }
+
+    private void Invalidate(string path)
+    {
+        // 差し替え前の画像は並列照合中の他テンプレートが参照している可能性があるため、
+        // ここでは破棄せずファイナライザによる解放に任せる。
+        // 読み込み中のスレッドが登録後に変更を検知できるよう、削除より先に世代番号を進める
+        AdvanceGeneration(path);
+        foreach (var key in _templateImages.Keys)
+        {
+            if (string.Equals(key.Path, path, StringComparison.OrdinalIgnoreCase) &&
+                _templateImages.TryRemove(key, out _))
+            {
+                LogTemplateChanged(_logger, path);
+            }
+        }
+    }
+
+    private void AdvanceGeneration(string path)
+    {
+        // 読み込んだことのあるパスだけを対象にし、フォルダ内の無関係なファイルの変更で辞書が増えないようにする
+        while (_generations.TryGetValue(path, out var generation))
+        {
+            if (_generations.TryUpdate(path, generation + 1, generation))
+            {
+                return;
+            }
+        }
+    }
+
+    public void Dispose()
+    {
+        lock (_watcherGate)
+        {
+            foreach (var watcher in _watchers.Values)
+            {
+                watcher.Dispose();
+            }
+
+            _watchers.Clear();
+        }
+
+        foreach (var cached in _templateImages.Values)
+        {
+            cached.Dispose();
+        }
+
+        _templateImages.Clear();
+
+        foreach (var buffer in _resultBuffers.Values)
+        {
+            buffer.Dispose();
+        }
+
+        _resultBuffers.Clear();
+    }
+
+    // ログはソース生成で定義し、照合ごとに到達するものも含めて引数のボックス化や配列確保を避ける
+    [LoggerMessage(Level = LogLevel.Information, Message = "OpenCV最適化: {UseOptimized}, スレッド数: {Threads}, {Features}")]
+    private static partial void LogOpenCvOptimization(ILogger logger, bool useOptimized, int threads, string features);
+
+    [LoggerMessage(Level = LogLevel.Warning, Message = "テンプレートサイズがキャプチャ領域より大きいためスキップします: {TemplateWidth}x{TemplateHeight} vs {CaptureWidth}x{CaptureHeight}")]
+    private static partial void LogTemplateLargerThanCapture(ILogger logger, int templateWidth, int templateHeight, int captureWidth, int captureHeight);
+
+    [LoggerMessage(Level = LogLevel.Warning, Message = "テンプレート画像が見つかりません: {File}")]
+    private static partial void LogTemplateNotFound(ILogger logger, string file);
+
+    [LoggerMessage(Level = LogLevel.Warning, Message = "テンプレート画像の読み込みに失敗しました: {File}")]
+    private static partial void LogTemplateLoadFailed(ILogger logger, Exception? exception, string file);
+
+    [LoggerMessage(Level = LogLevel.Warning, Message = "テンプレート画像の事前読み込みに失敗しました: {File}")]
+    private static partial void LogPreloadFailed(ILogger logger, Exception exception, string file);
+
+    [LoggerMessage(Level = LogLevel.Debug, Message = "テンプレート画像を読み込みました: {File} ({Width}x{Height})")]
+    private static partial void LogTemplateLoaded(ILogger logger, string file, int width, int height);
+
+    [LoggerMessage(Level = LogLevel.Debug, Message = "テンプレート画像の変更を検知しました: {File}")]
+    private static partial void LogTemplateChanged(ILogger logger, string file);
+
+    [LoggerMessage(Level = LogLevel.Warning, Message = "テンプレートフォルダの監視でエラーが発生したため、キャッシュを破棄します。")]
+    private static partial void LogWatcherError(ILogger logger, Exception exception);
+
+    private readonly record struct TemplateKey(string Path, bool Grayscale);
+
+    /// <summary>
+    /// 読み込み済みのテンプレート画像と、必要になった段数までの縮小画像を保持する。
+    /// </summary>
+    private sealed class CachedTemplate : IDisposable
+    {
+        private readonly List<Mat> _pyramid = new();
+
+        public CachedTemplate(Mat image)
+        {
+            Image = image;
+        }
+
+        public Mat Image { get; }
+
+        public Mat GetLevel(int level)
+        {
+            if (level == 0)
+            {
+                return Image;
+            }
+
+            lock (_pyramid)
+            {
+                while (_pyramid.Count < level)
+                {
+                    var source = _pyramid.Count == 0 ? Image : _pyramid[^1];
+                    var down = new Mat();
+                    Cv2.PyrDown(source, down);
+                    _pyramid.Add(down);
+                }
+
+                return _pyramid[level - 1];
+            }
+        }
+
+        public void Dispose()
+        {
+            lock (_pyramid)
+            {
+                foreach (var level in _pyramid)
+                {
+                    level.Dispose();
+                }
+
+                _pyramid.Clear();
+            }
+
+            Image.Dispose();
+        }
+    }
 }
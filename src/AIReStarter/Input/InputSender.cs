@@ -1,6 +1,5 @@
 using System;
 using System.Collections.Generic;
-using System.Linq;
 using System.Runtime.InteropServices;
 using System.Threading;
 using System.Threading.Tasks;
@@ -14,6 +13,29 @@ namespace AIReStarter.Input;
 /// </summary>
 public sealed class InputSender
 {
+    private static readonly int InputSize = Marshal.SizeOf<INPUT>();
+
+    // 修飾キー名は大文字小文字を区別しない辞書で一度だけ定義し、判定ごとの小文字化を避ける
+    private static readonly Dictionary<string, ushort> ModifierVirtualKeys = new(StringComparer.OrdinalIgnoreCase)
+    {
+        ["ctrl"] = (ushort)Keys.ControlKey,
+        ["control"] = (ushort)Keys.ControlKey,
+        ["shift"] = (ushort)Keys.ShiftKey,
+        ["alt"] = (ushort)Keys.Menu,
+        ["win"] = (ushort)Keys.LWin,
+        ["lwin"] = (ushort)Keys.LWin,
+        ["rwin"] = (ushort)Keys.LWin
+    };
+
+    // Keys列挙体に無い別名を含むキー名も同様に一度だけ定義する
+    private static readonly Dictionary<string, ushort> NamedVirtualKeys = new(StringComparer.OrdinalIgnoreCase)
+    {
+        ["enter"] = (ushort)Keys.Return,
+        ["esc"] = (ushort)Keys.Escape,
+        ["escape"] = (ushort)Keys.Escape,
+        ["space"] = (ushort)Keys.Space
+    };
+
     private readonly ILogger<InputSender> _logger;
 
     public InputSender(ILogger<InputSender> logger)
@@ -38,7 +60,7 @@ public sealed class InputSender
                     CreateMouseInput(MouseEventFlags.LEFTUP)
                 };
 
-                if (SendInput((uint)inputs.Length, inputs, Marshal.SizeOf<INPUT>()) == 0)
+                if (SendInput((uint)inputs.Length, inputs, InputSize) == 0)
                 {
                     throw new InvalidOperationException("SendInputに失敗しました。");
                 }
@@ -69,21 +91,7 @@ public sealed class InputSender
                 continue;
             }
 
-            var inputs = new List<INPUT>();
-            foreach (var mod in modifiers)
-            {
-                inputs.Add(CreateKeyboardInput(mod, false));
-            }
-
-            inputs.Add(CreateKeyboardInput(keyCode, false));
-            inputs.Add(CreateKeyboardInput(keyCode, true));
-
-            for (var i = modifiers.Count - 1; i >= 0; i--)
-            {
-                inputs.Add(CreateKeyboardInput(modifiers[i], true));
-            }
-
-            if (SendInput((uint)inputs.Count, inputs.ToArray(), Marshal.SizeOf<INPUT>()) == 0)
+            if (!SendKeyPress(keyCode, modifiers))
             {
                 _logger.LogWarning("文字送出に失敗しました: {Char}", ch);
             }
@@ -99,14 +107,19 @@ public sealed class InputSender
             return;
         }
 
-        var modifiers = keys
-            .Where(IsModifier)
-            .Select(k => ResolveModifier(k))
-            .ToList();
-
-        var mainKeys = keys
-            .Where(k => !IsModifier(k))
-            .ToList();
+        var modifiers = new List<ushort>(keys.Count);
+        var mainKeys = new List<string>(keys.Count);
+        foreach (var key in keys)
+        {
+            if (ModifierVirtualKeys.TryGetValue(key, out var modifier))
+            {
+                modifiers.Add(modifier);
+            }
+            else
+            {
+                mainKeys.Add(key);
+            }
+        }
 
         if (mainKeys.Count == 0 && modifiers.Count > 0)
         {
@@ -123,23 +136,17 @@ public sealed class InputSender
                 continue;
             }
 
-            var modifiersToPress = modifiers.Concat(extraModifiers).ToList();
-            var inputs = new List<INPUT>();
-
-            foreach (var mod in modifiersToPress)
-            {
-                inputs.Add(CreateKeyboardInput(mod, false));
-            }
-
-            inputs.Add(CreateKeyboardInput(vk, false));
-            inputs.Add(CreateKeyboardInput(vk, true));
-
-            for (var i = modifiersToPress.Count - 1; i >= 0; i--)
+            // 追加の修飾キーが無い場合（大半のキー）は共通の修飾キーをそのまま使う
+            IReadOnlyList<ushort> modifiersToPress = modifiers;
+            if (extraModifiers.Count > 0)
             {
-                inputs.Add(CreateKeyboardInput(modifiersToPress[i], true));
+                var combined = new List<ushort>(modifiers.Count + extraModifiers.Count);
+                combined.AddRange(modifiers);
+                combined.AddRange(extraModifiers);
+                modifiersToPress = combined;
             }
 
-            if (SendInput((uint)inputs.Count, inputs.ToArray(), Marshal.SizeOf<INPUT>()) == 0)
+            if (!SendKeyPress(vk, modifiersToPress))
             {
                 _logger.LogWarning("キー送出に失敗しました: {Key}", key);
             }
@@ -148,22 +155,28 @@ public sealed class InputSender
         }
     }
 
-    private static bool IsModifier(string key)
+    /// <summary>
+    /// 修飾キー押下→キー押下/解放→修飾キー解放（逆順）を1回のSendInputで送出する。
+    /// </summary>
+    private static bool SendKeyPress(ushort keyCode, IReadOnlyList<ushort> modifiers)
     {
-        var lower = key.ToLowerInvariant();
-        return lower is "ctrl" or "control" or "shift" or "alt" or "win" or "lwin" or "rwin";
-    }
+        // 要素数は確定しているため、SendInputへ渡す配列を直接組み立てる
+        var inputs = new INPUT[modifiers.Count * 2 + 2];
+        var index = 0;
+        foreach (var mod in modifiers)
+        {
+            inputs[index++] = CreateKeyboardInput(mod, false);
+        }
 
-    private static ushort ResolveModifier(string key)
-    {
-        var lower = key.ToLowerInvariant();
-        return lower switch
+        inputs[index++] = CreateKeyboardInput(keyCode, false);
+        inputs[index++] = CreateKeyboardInput(keyCode, true);
+
+        for (var i = modifiers.Count - 1; i >= 0; i--)
         {
-            "ctrl" or "control" => (ushort)Keys.ControlKey,
-            "shift" => (ushort)Keys.ShiftKey,
-            "alt" => (ushort)Keys.Menu,
-            _ => (ushort)Keys.LWin
-        };
+            inputs[index++] = CreateKeyboardInput(modifiers[i], true);
+        }
+
+        return SendInput((uint)inputs.Length, inputs, InputSize) != 0;
     }
 
     private static bool TryResolveVirtualKey(string key, out ushort code, out List<ushort> modifiers)
@@ -194,28 +207,19 @@ public sealed class InputSender
             }
         }
 
-        if (Enum.TryParse<Keys>(key, true, out var parsed))
+        if (NamedVirtualKeys.TryGetValue(key, out code))
         {
-            code = (ushort)parsed;
             return true;
         }
 
-        switch (key.ToLowerInvariant())
+        if (Enum.TryParse<Keys>(key, true, out var parsed))
         {
-            case "enter":
-                code = (ushort)Keys.Return;
-                return true;
-            case "esc":
-            case "escape":
-                code = (ushort)Keys.Escape;
-                return true;
-            case "space":
-                code = (ushort)Keys.Space;
-                return true;
-            default:
-                code = 0;
-                return false;
+            code = (ushort)parsed;
+            return true;
         }
+
+        code = 0;
+        return false;
     }
 
     private static INPUT CreateMouseInput(MouseEventFlags flags)
@@ -1,5 +1,5 @@
 using System.ComponentModel;
-using System.Collections.ObjectModel;
+using System.Text;
 using System.Windows;
 using AIReStarter.Core;
 using AIReStarter.Services;
@@ -12,15 +12,12 @@ public partial class MainWindow : Window
     private readonly DisplayManager _displayManager;
     private bool _allowClose;
 
-    public ObservableCollection<string> Monitors { get; } = new();
-
     public MainWindow(MonitorService monitorService, DisplayManager displayManager)
     {
         InitializeComponent();
         _monitorService = monitorService;
         _displayManager = displayManager;
 
-        DataContext = this;
         RefreshMonitors();
         UpdateStatus();
     }
@@ -39,14 +36,17 @@ public partial class MainWindow : Window
 
     private void RefreshMonitors()
     {
-        Monitors.Clear();
+        // 読み取り専用の数行だけなので、行ごとの要素を生成せず1つのTextBlockへまとめて設定する
+        var builder = new StringBuilder();
         foreach (var display in _displayManager.GetMonitors())
         {
-            Monitors.Add($"{display.DeviceName} | {display.Bounds.Left},{display.Bounds.Top} {display.Bounds.Width}x{display.Bounds.Height} | DPI x{display.DpiScaleX:0.00}");
+            builder.AppendLine($"{display.DeviceName} | {display.Bounds.Left},{display.Bounds.Top} {display.Bounds.Width}x{display.Bounds.Height} | DPI x{display.DpiScaleX:0.00}");
         }
 
         var virtualScreen = _displayManager.GetVirtualScreenBounds();
-        Monitors.Add($"Virtual: {virtualScreen.Left},{virtualScreen.Top} {virtualScreen.Width}x{virtualScreen.Height}");
+        builder.Append($"Virtual: {virtualScreen.Left},{virtualScreen.Top} {virtualScreen.Width}x{virtualScreen.Height}");
+
+        MonitorText.Text = builder.ToString();
     }
 
     private void UpdateStatus()
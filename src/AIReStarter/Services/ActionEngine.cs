@@ -13,6 +13,8 @@ namespace AIReStarter.Services;
 /// </summary>
 public sealed class ActionEngine
 {
+    private static readonly string[] EnterKey = { "Enter" };
+
     private readonly AppConfig _config;
     private readonly InputSender _inputSender;
     private readonly ILogger<ActionEngine> _logger;
@@ -59,7 +61,7 @@ public sealed class ActionEngine
 
         _logger.LogInformation("チャット送信: {Command}", chat.Command);
         await _inputSender.SendTextAsync(chat.Command, _config.Global.ActionDelayMilliseconds, cancellationToken);
-        await _inputSender.SendChordAsync(new[] { "Enter" }, _config.Global.ActionDelayMilliseconds, cancellationToken);
+        await _inputSender.SendChordAsync(EnterKey, _config.Global.ActionDelayMilliseconds, cancellationToken);
     }
 
     private Task ExecuteKeyboardAsync(ActionConfig.Keyboard keyboard, CancellationToken cancellationToken)
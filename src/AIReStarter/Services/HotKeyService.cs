@@ -17,6 +17,7 @@ public sealed class HotKeyService : IDisposable
 
     private readonly ILogger<HotKeyService> _logger;
     private readonly HwndSource _hwndSource;
+    private readonly HwndSourceHook _hook;
     private readonly Dictionary<int, Action> _handlers = new();
     private int _currentId;
 
@@ -33,8 +34,10 @@ public sealed class HotKeyService : IDisposable
             WindowStyle = unchecked((int)0x80000000) // WS_DISABLED
         };
 
+        // AddHook/RemoveHookで同一インスタンスを使うため、デリゲートは一度だけ生成する
+        _hook = WndProc;
         _hwndSource = new HwndSource(parameters);
-        _hwndSource.AddHook(WndProc);
+        _hwndSource.AddHook(_hook);
     }
 
     public void Register(Key key, ModifierKeys modifiers, Action handler)
@@ -73,7 +76,7 @@ public sealed class HotKeyService : IDisposable
             UnregisterHotKey(_hwndSource.Handle, handler.Key);
         }
 
-        _hwndSource.RemoveHook(WndProc);
+        _hwndSource.RemoveHook(_hook);
         _hwndSource.Dispose();
     }
 
@@ -1,4 +1,7 @@
 using System;
+using System.Collections.Generic;
+using System.Drawing;
+using System.Linq;
 using System.Threading;
 using System.Threading.Tasks;
 using AIReStarter.Config;
@@ -10,7 +13,7 @@ namespace AIReStarter.Services;
 /// <summary>
 /// 監視ループを管理し、テンプレート検出とアクション実行を仲介する。
 /// </summary>
-public sealed class MonitorService : IAsyncDisposable
+public sealed partial class MonitorService : IAsyncDisposable
 {
     private readonly AppConfig _config;
     private readonly DisplayManager _displayManager;
@@ -20,6 +23,8 @@ public sealed class MonitorService : IAsyncDisposable
     private readonly MatchGuard _guard;
     private readonly ILogger<MonitorService> _logger;
 
+    private Rectangle[]? _regions;
+    private int _regionsLayoutVersion;
     private CancellationTokenSource? _cts;
     private Task? _worker;
 
@@ -97,45 +102,149 @@ public sealed class MonitorService : IAsyncDisposable
         var cooldown = TimeSpan.FromSeconds(_config.Global.CooldownSeconds);
         var interval = TimeSpan.FromSeconds(_config.Global.CheckIntervalSeconds);
 
+        // 初回サイクルでテンプレートを1件ずつ読み込むと最初の検出が遅れるため、先にまとめて読み込む
+        _matcher.Preload(_config.Templates, cancellationToken);
+
         while (!cancellationToken.IsCancellationRequested)
         {
-            foreach (var template in _config.Templates)
+            await RunCycleAsync(cooldown, cancellationToken).ConfigureAwait(false);
+
+            try
+            {
+                await Task.Delay(interval, cancellationToken).ConfigureAwait(false);
+            }
+            catch (OperationCanceledException)
+            {
+                // 監視終了
+            }
+        }
+    }
+
+    private async Task RunCycleAsync(TimeSpan cooldown, CancellationToken cancellationToken)
+    {
+        var pending = new List<PendingMatch>(_config.Templates.Count);
+        var captures = new Dictionary<Rectangle, CaptureResult>();
+        try
+        {
+            // キャプチャ後すぐに照合を開始し、テンプレート間で並列に進める。
+            // 同じ領域を監視するテンプレートは1枚のキャプチャ（とそのグレースケール変換）を共有する
+            var regions = GetRegions();
+            for (var i = 0; i < _config.Templates.Count; i++)
             {
                 cancellationToken.ThrowIfCancellationRequested();
 
-                var bounds = _displayManager.GetAbsoluteRegion(template.MonitorRegion, template.Monitor);
-                using var capture = _captureService.Capture(bounds);
+                var template = _config.Templates[i];
+                if (_guard.IsCoolingDown(template.Name, DateTimeOffset.UtcNow))
+                {
+                    continue;
+                }
+
+                var bounds = regions[i];
+
+                // 領域に収まらないテンプレートはキャプチャ前に除外し、不要なキャプチャを避ける
+                if (!_matcher.FitsWithin(template, bounds.Size))
+                {
+                    LogTemplateLargerThanRegion(_logger, template.Name, bounds.Width, bounds.Height);
+                    continue;
+                }
+
+                if (!captures.TryGetValue(bounds, out var capture))
+                {
+                    capture = _captureService.Capture(bounds);
+                    captures.Add(bounds, capture);
+                }
+
+                pending.Add(new PendingMatch(template, bounds, _matcher.FindAsync(template, capture, cancellationToken)));
+            }
+
+            // ガード判定とアクション実行は設定順に直列で行う
+            var actionExecuted = false;
+            foreach (var item in pending)
+            {
+                var result = await item.Match.ConfigureAwait(false);
+                if (actionExecuted)
+                {
+                    // 先に実行したアクションで画面が変わっている可能性があるため、
+                    // アクション前のキャプチャによる照合結果は使わずに撮り直して照合する。
+                    // 照合結果の行列はテンプレートごとに共有されるため、元の照合の完了を待ってから行う
+                    result = await RematchAsync(item, cancellationToken).ConfigureAwait(false);
+                }
 
-                var result = await _matcher.FindAsync(template, capture, cancellationToken).ConfigureAwait(false);
                 if (result is null)
                 {
                     continue;
                 }
 
+                var template = item.Template;
                 var now = DateTimeOffset.UtcNow;
                 if (!_guard.ShouldTrigger(template.Name, cooldown, _config.Global.MaxConsecutiveMatches, now))
                 {
-                    _logger.LogDebug("ガードにより抑止: {Template}", template.Name);
+                    LogSuppressedByGuard(_logger, template.Name);
                     continue;
                 }
 
-                _logger.LogInformation("テンプレート一致: {Template} ({Score:P2}) @ {Location}", template.Name, result.Score, result.Location);
+                LogTemplateMatched(_logger, template.Name, result.Score, result.Location);
                 await _actionEngine.ExecuteAsync(template.Action, result, cancellationToken).ConfigureAwait(false);
+                actionExecuted = true;
             }
-
+        }
+        finally
+        {
+            // 照合中のタスクがキャプチャを参照しているため、すべて終わってから破棄する
             try
             {
-                await Task.Delay(interval, cancellationToken).ConfigureAwait(false);
+                await Task.WhenAll(pending.Select(item => item.Match)).ConfigureAwait(false);
             }
-            catch (OperationCanceledException)
+            catch (Exception)
             {
-                // 監視終了
+                // 例外は上の直列処理で観測済み、または中断によるもの
+            }
+
+            foreach (var capture in captures.Values)
+            {
+                capture.Dispose();
             }
         }
     }
 
+    private async Task<MatchResult?> RematchAsync(PendingMatch item, CancellationToken cancellationToken)
+    {
+        using var capture = _captureService.Capture(item.Bounds);
+        return await _matcher.FindAsync(item.Template, capture, cancellationToken).ConfigureAwait(false);
+    }
+
+    /// <summary>
+    /// テンプレートごとの監視領域（絶対座標）を返す。
+    /// 計算結果はディスプレイ構成が変わるまで使い回す。
+    /// </summary>
+    private Rectangle[] GetRegions()
+    {
+        var layoutVersion = _displayManager.LayoutVersion;
+        if (_regions is null || _regionsLayoutVersion != layoutVersion)
+        {
+            _regions = _config.Templates
+                .Select(template => _displayManager.GetAbsoluteRegion(template.MonitorRegion, template.Monitor))
+                .ToArray();
+            _regionsLayoutVersion = layoutVersion;
+        }
+
+        return _regions;
+    }
+
     public async ValueTask DisposeAsync()
     {
         await StopAsync();
     }
+
+    // 監視サイクルごとに到達するログはソース生成で定義し、レベル判定と引数の受け渡しで割り当てを発生させない
+    [LoggerMessage(Level = LogLevel.Warning, Message = "テンプレートサイズが監視領域より大きいためスキップします: {Template} ({Width}x{Height})")]
+    private static partial void LogTemplateLargerThanRegion(ILogger logger, string template, int width, int height);
+
+    [LoggerMessage(Level = LogLevel.Debug, Message = "ガードにより抑止: {Template}")]
+    private static partial void LogSuppressedByGuard(ILogger logger, string template);
+
+    [LoggerMessage(Level = LogLevel.Information, Message = "テンプレート一致: {Template} ({Score:P2}) @ {Location}")]
+    private static partial void LogTemplateMatched(ILogger logger, string template, double score, System.Drawing.Point location);
+
+    private sealed record PendingMatch(TemplateConfig Template, Rectangle Bounds, Task<MatchResult?> Match);
 }
@@ -0,0 +1,83 @@
+using System.Text;
+using AIReStarter.Config;
+using FluentAssertions;
+
+namespace AIReStarter.Tests;
+
+public class ConfigLoaderMatchingTests
+{
+    // ConfigLoaderは状態を持たないため、テスト間で1つのインスタンスを共有する
+    private static readonly ConfigLoader Loader = new();
+
+    [Fact]
+    public void Load_ParsesGrayscaleOption()
+    {
+        // Act
+        var config = LoadWithMatching(
+            "grayscale = true",
+            string.Empty);
+
+        // Assert
+        config.Templates.Should().HaveCount(2);
+        config.Templates[0].Matching.Grayscale.Should().BeTrue();
+        config.Templates[1].Matching.Grayscale.Should().BeFalse();
+    }
+
+    [Fact]
+    public void Load_ParsesPyramidLevels()
+    {
+        // Act
+        var config = LoadWithMatching(
+            "pyramid_levels = 2",
+            "pyramid_levels = -1",
+            string.Empty);
+
+        // Assert
+        config.Templates.Should().HaveCount(3);
+        config.Templates[0].Matching.PyramidLevels.Should().Be(2);
+        config.Templates[1].Matching.PyramidLevels.Should().Be(0);
+        config.Templates[2].Matching.PyramidLevels.Should().Be(0);
+    }
+
+    [Fact]
+    public void Load_ParsesMatchMethod()
+    {
+        // Act
+        var config = LoadWithMatching(
+            "method = \"SQDIFF_NORMED\"",
+            "method = \"unknown\"",
+            "method = \"ccorr_normed\"",
+            string.Empty);
+
+        // Assert
+        config.Templates.Should().HaveCount(4);
+        config.Templates[0].Matching.Method.Should().Be(MatchMethod.SqDiffNormed);
+        config.Templates[1].Matching.Method.Should().Be(MatchMethod.CCoeffNormed);
+        config.Templates[2].Matching.Method.Should().Be(MatchMethod.CCorrNormed);
+        config.Templates[3].Matching.Method.Should().Be(MatchMethod.CCoeffNormed);
+    }
+
+    /// <summary>
+    /// matchingセクションに追加する行だけを受け取り、1行につき1テンプレートのTOMLを組み立てて読み込む。
+    /// </summary>
+    private static AppConfig LoadWithMatching(params string[] matchingLines)
+    {
+        var toml = new StringBuilder();
+        for (var i = 0; i < matchingLines.Length; i++)
+        {
+            toml.AppendLine("[[templates]]");
+            toml.AppendLine($"name = \"template{i}\"");
+            toml.AppendLine();
+            toml.AppendLine("[templates.matching]");
+            toml.AppendLine("file = \"templates/run_button.png\"");
+            toml.AppendLine(matchingLines[i]);
+            toml.AppendLine();
+        }
+
+        using var tempDir = new TempDirectory();
+        var configPath = Path.Combine(tempDir.FullPath, "profiles.toml");
+        File.WriteAllText(configPath, toml.ToString());
+
+        return Loader.Load(configPath);
+    }
+}
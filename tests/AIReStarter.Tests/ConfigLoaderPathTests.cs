@@ -1,20 +1,21 @@
-using System.IO;
 using AIReStarter.Config;
 using FluentAssertions;
-using Xunit;
 
 namespace AIReStarter.Tests;
 
 public class ConfigLoaderPathTests
 {
+    // ConfigLoaderは状態を持たないため、テスト間で1つのインスタンスを共有する
+    private static readonly ConfigLoader Loader = new();
+
     [Fact]
     public void Load_ResolvesRelativeTemplatePath_ToAbsolute()
     {
         // Arrange
-        var tempDir = Path.Combine(Path.GetTempPath(), Path.GetRandomFileName());
-        Directory.CreateDirectory(Path.Combine(tempDir, "templates"));
+        using var tempDir = new TempDirectory();
+        Directory.CreateDirectory(Path.Combine(tempDir.FullPath, "templates"));
 
-        var configPath = Path.Combine(tempDir, "profiles.toml");
+        var configPath = Path.Combine(tempDir.FullPath, "profiles.toml");
         File.WriteAllText(configPath, @"
 [global]
 check_interval = 1.0
@@ -37,22 +38,30 @@ threshold = 0.5
 type = ""click""
 ");
 
-        var loader = new ConfigLoader();
-
         // Act
-        var config = loader.Load(configPath);
+        var config = Loader.Load(configPath);
 
         // Assert
-        config.Templates.Should().HaveCount(1);
-        config.Templates[0].Matching.File.Should().Be(
-            Path.Combine(tempDir, "templates", "run_button.png"));
+        // 設定はレコードのため、期待値との値の等価性で全項目をまとめて検証する
+        config.Templates.Should().ContainSingle().Which.Should().Be(new TemplateConfig
+        {
+            Name = "sample",
+            Monitor = string.Empty,
+            ExecutionMode = ExecutionMode.Click,
+            MonitorRegion = new MonitorRegion { X = 0, Y = 0, Width = 1, Height = 1 },
+            Matching = new MatchingConfig
+            {
+                File = Path.Combine(tempDir.FullPath, "templates", "run_button.png"),
+                Threshold = 0.5
+            },
+            Action = new ActionConfig.Click(0, 0, 3)
+        });
     }
 
     [Fact]
     public void Load_ProfilesToml_ShouldSucceed()
     {
-        var loader = new ConfigLoader();
-        var config = loader.Load(TestPathHelper.FindRepoFile("profiles.toml"));
+        var config = Loader.Load(TestPathHelper.FindRepoFile("profiles.toml"));
 
         config.Templates.Should().NotBeNull();
         config.Templates.Should().NotBeEmpty();
@@ -1,41 +1,69 @@
-using System;
 using AIReStarter.Core;
 using FluentAssertions;
-using Xunit;
 
 namespace AIReStarter.Tests;
 
 public class MatchGuardTests
 {
-    [Fact]
-    public void ShouldTrigger_AllowsFirstMatches()
+    private const string TemplateKey = "template";
+
+    // 判定は引数の時刻だけで決まるため、実時刻ではなく固定の基準時刻を使う
+    private static readonly DateTimeOffset BaseTime = new(2025, 1, 1, 0, 0, 0, TimeSpan.Zero);
+    private static readonly TimeSpan ShortCooldown = TimeSpan.FromSeconds(2);
+
+    [Theory]
+    [InlineData(10, 2, new[] { 0, 1 }, new[] { true, true })]
+    [InlineData(10, 2, new[] { 0, 1, 2 }, new[] { true, true, false })]
+    [InlineData(2, 1, new[] { 0, 1, 3 }, new[] { true, false, true })]
+    public void ShouldTrigger_FollowsConsecutiveLimitAndCooldown(int cooldownSeconds, int maxConsecutive, int[] offsetSeconds, bool[] expected)
     {
+        // 1件目: 上限までは許可 / 2件目: 上限超過で抑止 / 3件目: クールダウン明けに再許可
         var guard = new MatchGuard();
-        var now = DateTimeOffset.UtcNow;
+        var cooldown = TimeSpan.FromSeconds(cooldownSeconds);
+
+        var actual = offsetSeconds
+            .Select(offset => guard.ShouldTrigger(TemplateKey, cooldown, maxConsecutive, BaseTime.AddSeconds(offset)))
+            .ToArray();
 
-        guard.ShouldTrigger("template", TimeSpan.FromSeconds(10), 2, now).Should().BeTrue();
-        guard.ShouldTrigger("template", TimeSpan.FromSeconds(10), 2, now.AddSeconds(1)).Should().BeTrue();
+        actual.Should().Equal(expected);
     }
 
     [Fact]
-    public void ShouldTrigger_BlocksAfterMaxConsecutive()
+    public void IsCoolingDown_ReflectsCooldownWindow()
     {
         var guard = new MatchGuard();
-        var now = DateTimeOffset.UtcNow;
 
-        guard.ShouldTrigger("template", TimeSpan.FromSeconds(10), 2, now).Should().BeTrue();
-        guard.ShouldTrigger("template", TimeSpan.FromSeconds(10), 2, now.AddSeconds(1)).Should().BeTrue();
-        guard.ShouldTrigger("template", TimeSpan.FromSeconds(10), 2, now.AddSeconds(2)).Should().BeFalse();
+        guard.IsCoolingDown(TemplateKey, BaseTime).Should().BeFalse();
+
+        guard.ShouldTrigger(TemplateKey, ShortCooldown, 1, BaseTime).Should().BeTrue();
+        guard.ShouldTrigger(TemplateKey, ShortCooldown, 1, BaseTime.AddSeconds(1)).Should().BeFalse();
+
+        guard.IsCoolingDown(TemplateKey, BaseTime.AddSeconds(2)).Should().BeTrue();
+        guard.IsCoolingDown(TemplateKey, BaseTime.AddSeconds(3)).Should().BeFalse();
     }
 
     [Fact]
-    public void ShouldTrigger_AllowsAfterCooldown()
+    public void ShouldTrigger_KeepsStatePerKeyUnderParallelAccess()
     {
+        // 状態の登録はConcurrentDictionaryで行うため、異なるキーを別々のスレッドから使っても状態が混ざらないことを確認する。
+        // 1つのキーの状態更新は不可分ではないため、同じキーを並列に呼び出す場合は対象外
+        // （監視ループはガード判定を直列に行う）
+        const int keyCount = 64;
         var guard = new MatchGuard();
-        var now = DateTimeOffset.UtcNow;
+        var results = new bool[keyCount][];
+
+        Parallel.For(0, keyCount, i =>
+        {
+            var key = $"{TemplateKey}-{i}";
+            results[i] = new[]
+            {
+                guard.ShouldTrigger(key, ShortCooldown, 1, BaseTime),
+                guard.ShouldTrigger(key, ShortCooldown, 1, BaseTime.AddSeconds(1))
+            };
+        });
 
-        guard.ShouldTrigger("template", TimeSpan.FromSeconds(2), 1, now).Should().BeTrue();
-        guard.ShouldTrigger("template", TimeSpan.FromSeconds(2), 1, now.AddSeconds(1)).Should().BeFalse();
-        guard.ShouldTrigger("template", TimeSpan.FromSeconds(2), 1, now.AddSeconds(3)).Should().BeTrue();
+        results.Should().AllSatisfy(result => result.Should().Equal(true, false));
+        Enumerable.Range(0, keyCount)
+            .Should().OnlyContain(i => guard.IsCoolingDown($"{TemplateKey}-{i}", BaseTime.AddSeconds(2)));
     }
 }
@@ -0,0 +1,31 @@
+namespace AIReStarter.Tests;
+
+/// <summary>
+/// テストごとの一時ディレクトリを作成し、Disposeで中身ごと削除する。
+/// </summary>
+internal sealed class TempDirectory : IDisposable
+{
+    public TempDirectory()
+    {
+        FullPath = Path.Combine(Path.GetTempPath(), Path.GetRandomFileName());
+        Directory.CreateDirectory(FullPath);
+    }
+
+    public string FullPath { get; }
+
+    public void Dispose()
+    {
+        try
+        {
+            Directory.Delete(FullPath, recursive: true);
+        }
+        catch (IOException)
+        {
+            // 削除できなくてもテスト結果には影響しないため無視する
+        }
+        catch (UnauthorizedAccessException)
+        {
+            // 同上
+        }
+    }
+}
@@ -0,0 +1,227 @@
+using AIReStarter.Config;
+using AIReStarter.Core;
+using FluentAssertions;
+using Microsoft.Extensions.Logging.Abstractions;
+using OpenCvSharp;
+using CvPoint = OpenCvSharp.Point;
+using CvRect = OpenCvSharp.Rect;
+
+namespace AIReStarter.Tests;
+
+public class TemplateMatcherTests : IDisposable
+{
+    private const int TemplateSize = 64;
+    private const int FrameWidth = 320;
+    private const int FrameHeight = 240;
+
+    // テンプレートの外周と背景を同じ色にし、縮小時の境界の差でスコアが揺れないようにする
+    private static readonly Scalar Background = Scalar.All(128);
+    // ccorr_normedは明るさが一様な領域でも高いスコアになるため、方式ごとの比較では黒背景のテンプレートを使う
+    private static readonly Scalar ContrastBackground = Scalar.All(0);
+    // 結果の座標にキャプチャ領域の位置が加算されることも確認するため、原点以外に置く
+    private static readonly System.Drawing.Point Origin = new(100, 50);
+
+    private readonly TempDirectory _tempDir = new();
+    private readonly TemplateMatcher _matcher = new(NullLogger<TemplateMatcher>.Instance);
+    private readonly string _templatePath;
+
+    public TemplateMatcherTests()
+    {
+        using var image = CreateTemplateImage(Background);
+        _templatePath = WriteTemplate("template.png", image);
+    }
+
+    [Theory]
+    [InlineData(0, 120, 80)]
+    [InlineData(1, 120, 80)]
+    [InlineData(2, 120, 80)]
+    // 縮小画像の格子に揃わない位置
+    [InlineData(0, 101, 57)]
+    [InlineData(1, 101, 57)]
+    [InlineData(2, 101, 57)]
+    // 右端・下端に接する位置（詳細探索の範囲がフレーム内に収まるか）
+    [InlineData(0, FrameWidth - TemplateSize, FrameHeight - TemplateSize)]
+    [InlineData(1, FrameWidth - TemplateSize, FrameHeight - TemplateSize)]
+    [InlineData(2, FrameWidth - TemplateSize, FrameHeight - TemplateSize)]
+    // 右端・下端の近くで格子に揃わない位置
+    [InlineData(0, FrameWidth - TemplateSize - 3, FrameHeight - TemplateSize - 1)]
+    [InlineData(1, FrameWidth - TemplateSize - 3, FrameHeight - TemplateSize - 1)]
+    [InlineData(2, FrameWidth - TemplateSize - 3, FrameHeight - TemplateSize - 1)]
+    // テンプレートが小さくなりすぎる段数は実際に作れる段数に抑えられる
+    [InlineData(10, 120, 80)]
+    public async Task FindAsync_LocatesTemplateAtKnownPosition(int pyramidLevels, int x, int y)
+    {
+        // Arrange
+        using var image = CreateTemplateImage(Background);
+        using var capture = CreateCapture(image, Background, x, y);
+
+        // Act
+        var result = await _matcher.FindAsync(CreateTemplateConfig(_templatePath, pyramidLevels), capture, CancellationToken.None);
+
+        // Assert
+        result.Should().NotBeNull();
+        result!.Location.Should().Be(new System.Drawing.Point(Origin.X + x, Origin.Y + y));
+        result.Score.Should().BeApproximately(1.0, 0.01);
+    }
+
+    [Fact]
+    public async Task FindAsync_FallsBackToFullResolution_WhenTemplateIsTooSmallForPyramid()
+    {
+        // Arrange
+        // 12pxのテンプレートは1段縮小すると最小サイズを下回るため、縮小画像は使われない
+        using var image = new Mat(12, 12, MatType.CV_8UC3, Background);
+        Cv2.Rectangle(image, new CvRect(2, 3, 6, 5), new Scalar(30, 200, 90), -1);
+        var template = CreateTemplateConfig(WriteTemplate("small.png", image), pyramidLevels: 2);
+        using var capture = CreateCapture(image, Background, 51, 33);
+
+        // Act
+        var result = await _matcher.FindAsync(template, capture, CancellationToken.None);
+
+        // Assert
+        result.Should().NotBeNull();
+        result!.Location.Should().Be(new System.Drawing.Point(Origin.X + 51, Origin.Y + 33));
+        result.Score.Should().BeApproximately(1.0, 0.01);
+    }
+
+    [Fact]
+    public void FitsWithin_ComparesLoadedTemplateSize()
+    {
+        var template = CreateTemplateConfig(_templatePath);
+
+        // 読み込み前は判定できないため照合時の確認に任せる
+        _matcher.FitsWithin(template, new System.Drawing.Size(1, 1)).Should().BeTrue();
+
+        _matcher.Preload(new[] { template }, CancellationToken.None);
+
+        _matcher.FitsWithin(template, new System.Drawing.Size(TemplateSize, TemplateSize)).Should().BeTrue();
+        _matcher.FitsWithin(template, new System.Drawing.Size(TemplateSize - 1, TemplateSize)).Should().BeFalse();
+        _matcher.FitsWithin(template, new System.Drawing.Size(TemplateSize, TemplateSize - 1)).Should().BeFalse();
+    }
+
+    [Fact]
+    public void Preload_SkipsEmptyTemplatePath()
+    {
+        var template = CreateTemplateConfig(_templatePath);
+
+        // パスが空のテンプレートが混ざっていても、他のテンプレートは読み込まれる
+        _matcher.Invoking(matcher => matcher.Preload(new[] { CreateTemplateConfig(string.Empty), template }, CancellationToken.None))
+            .Should().NotThrow();
+        _matcher.FitsWithin(template, new System.Drawing.Size(TemplateSize - 1, TemplateSize - 1)).Should().BeFalse();
+    }
+
+    [Fact]
+    public void FitsWithin_ReturnsTrueForEmptyTemplatePath()
+    {
+        // 空のパスは照合時に警告して飛ばすため、ここでは例外にせず判定を委ねる
+        _matcher.FitsWithin(CreateTemplateConfig(string.Empty), new System.Drawing.Size(1, 1)).Should().BeTrue();
+    }
+
+    [Theory]
+    [InlineData(MatchMethod.CCoeffNormed)]
+    [InlineData(MatchMethod.SqDiffNormed)]
+    [InlineData(MatchMethod.CCorrNormed)]
+    public async Task FindAsync_ExactMatchScoresNearOne_ForEachMethod(MatchMethod method)
+    {
+        // Arrange
+        using var image = CreateTemplateImage(ContrastBackground);
+        var template = CreateTemplateConfig(WriteTemplate("contrast.png", image), method: method);
+        using var capture = CreateCapture(image, ContrastBackground, 120, 80);
+
+        // Act
+        var result = await _matcher.FindAsync(template, capture, CancellationToken.None);
+
+        // Assert
+        // 方式によらずスコアは大きいほど一致する値に揃えられ、しきい値を超える
+        result.Should().NotBeNull();
+        result!.Location.Should().Be(new System.Drawing.Point(Origin.X + 120, Origin.Y + 80));
+        result.Score.Should().BeApproximately(1.0, 0.01);
+    }
+
+    [Theory]
+    [InlineData(MatchMethod.CCoeffNormed)]
+    [InlineData(MatchMethod.SqDiffNormed)]
+    [InlineData(MatchMethod.CCorrNormed)]
+    public async Task FindAsync_ReturnsNullForMismatch_ForEachMethod(MatchMethod method)
+    {
+        // Arrange
+        using var image = CreateTemplateImage(ContrastBackground);
+        var template = CreateTemplateConfig(WriteTemplate("contrast.png", image), method: method);
+
+        // 明暗を反転した画像は、図形のある画素で暗く背景で明るくなるため、どの方式でも一致しない
+        var frame = new Mat();
+        Cv2.BitwiseNot(image, frame);
+        using var capture = new CaptureResult(frame, Origin);
+
+        // Act
+        var result = await _matcher.FindAsync(template, capture, CancellationToken.None);
+
+        // Assert
+        result.Should().BeNull();
+    }
+
+    [Fact]
+    public async Task FindAsync_ReturnsNullForEmptyTemplatePath()
+    {
+        // Arrange
+        // matchingテーブルを省略したテンプレートは画像のパスが空になる
+        var template = CreateTemplateConfig(string.Empty);
+        using var image = CreateTemplateImage(Background);
+        using var capture = CreateCapture(image, Background, 120, 80);
+
+        // Act
+        var result = await _matcher.FindAsync(template, capture, CancellationToken.None);
+
+        // Assert
+        result.Should().BeNull();
+    }
+
+    public void Dispose()
+    {
+        // フォルダ監視を止めてから一時ディレクトリを削除する
+        _matcher.Dispose();
+        _tempDir.Dispose();
+    }
+
+    private string WriteTemplate(string fileName, Mat image)
+    {
+        var path = Path.Combine(_tempDir.FullPath, fileName);
+        Cv2.ImEncode(".png", image, out var bytes);
+        File.WriteAllBytes(path, bytes);
+        return path;
+    }
+
+    private static TemplateConfig CreateTemplateConfig(string path, int pyramidLevels = 0, MatchMethod method = MatchMethod.CCoeffNormed)
+    {
+        return new TemplateConfig
+        {
+            Name = "synthetic",
+            Matching = new MatchingConfig
+            {
+                File = path,
+                Threshold = 0.8,
+                PyramidLevels = pyramidLevels,
+                Method = method
+            }
+        };
+    }
+
+    /// <summary>
+    /// 縮小しても形が残る大きさの図形を、背景色の余白を残して配置したテンプレートを作る。
+    /// </summary>
+    private static Mat CreateTemplateImage(Scalar background)
+    {
+        var image = new Mat(TemplateSize, TemplateSize, MatType.CV_8UC3, background);
+        Cv2.Rectangle(image, new CvRect(8, 8, 32, 24), new Scalar(30, 200, 90), -1);
+        Cv2.Circle(image, new CvPoint(44, 44), 12, new Scalar(220, 60, 160), -1);
+        Cv2.Rectangle(image, new CvRect(12, 40, 16, 16), new Scalar(250, 250, 250), -1);
+        return image;
+    }
+
+    private static CaptureResult CreateCapture(Mat template, Scalar background, int x, int y)
+    {
+        var frame = new Mat(FrameHeight, FrameWidth, MatType.CV_8UC3, background);
+        using var destination = new Mat(frame, new CvRect(x, y, template.Width, template.Height));
+        template.CopyTo(destination);
+        return new CaptureResult(frame, Origin);
+    }
+}
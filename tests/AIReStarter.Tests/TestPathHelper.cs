@@ -1,11 +1,18 @@
-using System;
-using System.IO;
+using System.Collections.Concurrent;
 
 namespace AIReStarter.Tests;
 
 internal static class TestPathHelper
 {
+    // 親ディレクトリをたどる探索結果は実行中に変わらないため、ファイル名ごとに一度だけ行う
+    private static readonly ConcurrentDictionary<string, string> Cache = new();
+
     public static string FindRepoFile(string fileName)
+    {
+        return Cache.GetOrAdd(fileName, Find);
+    }
+
+    private static string Find(string fileName)
     {
         var dir = Directory.GetCurrentDirectory();
 
@@ -1,8 +1,6 @@
-using System.IO;
 using FluentAssertions;
 using Tomlyn;
 using Tomlyn.Model;
-using Xunit;
 
 namespace AIReStarter.Tests;
 
@@ -1,10 +0,0 @@
-﻿namespace AIReStarter.Tests;
-
-public class UnitTest1
-{
-    [Fact]
-    public void Test1()
-    {
-
-    }
-}